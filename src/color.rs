@@ -7,10 +7,8 @@ pub type Color = Vec3A;
 
 
 pub fn to_rgb(pixel_color: Color, samples_per_pixel: f32) -> image::Rgb<u8> {
-    let mut pixel_color: Vec3A = pixel_color;
-    if pixel_color.x.is_nan() { pixel_color.x = 0.0; }
-    if pixel_color.y.is_nan() { pixel_color.y = 0.0; }
-    if pixel_color.z.is_nan() { pixel_color.z = 0.0; }
+    // NaN is the only value not equal to itself, so a single lane mask zeroes every NaN channel at once
+    let pixel_color: Vec3A = Vec3A::select(pixel_color.cmpeq(pixel_color), pixel_color, Vec3A::ZERO);
     let scale: f32 = 1.0 / samples_per_pixel;
     let rgb: Color = (pixel_color * scale).powf(0.5).clamp(Vec3A::new(0.0, 0.0, 0.0), Vec3A::new(0.999, 0.999, 0.999));
     image::Rgb([
@@ -29,6 +27,8 @@ mod tests {
     fn test_to_rgb() -> Result<(), std::fmt::Error> {
         let c: Color = Color::new(0.5, 1.0, 0.0);
         to_rgb(c, 1.0);
+        let nan: Color = Color::new(f32::NAN, 1.0, f32::NAN);
+        assert_eq!(to_rgb(nan, 1.0), image::Rgb([0, 255, 0]));
         Ok(())
     }
 }
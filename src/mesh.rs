@@ -3,18 +3,17 @@
 // Description: This file implements the Mesh struct
 
 use std::collections::HashMap;
-use std::ops::Mul;
 
 use bvh::aabb::Bounded;
 use bvh::bounding_hierarchy::BHShape;
-use stl_io::{self, Vector};
+use stl_io;
 use obj::{load_obj, Obj};
 
 use bvh::bvh::BVH;
 use bvh::{Point3 as BVHPoint3, Vector3 as BVHVector3};
 use bvh::ray::Ray as BVHRay;
 
-use glam::Vec3A;
+use glam::{Vec3A, Mat3A, Affine3A};
 
 use crate::ray::Ray;
 use crate::hit_record::HitRecord;
@@ -47,11 +46,22 @@ impl Mesh {
         let bvh: BVH = BVH::build(&mut triangles);
         Mesh { triangles, bvh, node_index: 0 }
     }
+    fn _build_transform(position: Point3, scaling_factor: Vec3A, rotation: Vec3A) -> Affine3A {
+        // Folds scale, translation and rotation into a single affine transform: R * (S * v + P) = (R * S) * v + R * P
+        let rotation_matrix: Mat3A =
+          Mat3A::from_rotation_x(rotation[0].to_radians())
+        * Mat3A::from_rotation_y(rotation[1].to_radians())
+        * Mat3A::from_rotation_z(rotation[2].to_radians());
+        Affine3A {
+            matrix3: rotation_matrix * Mat3A::from_diagonal(scaling_factor.into()),
+            translation: rotation_matrix * position,
+        }
+    }
     fn _load_obj_triangles(position: Point3, scaling_factor: f32, rotation: Vec3A, filename: &str, material: Box<dyn Material>) -> Vec<Triangle> {
         // let mut triangles: Vec<Triangle> = Vec::new();
         let objfile = std::fs::File::open(filename).unwrap();
         let input = std::io::BufReader::new(objfile);
-        let mut model: Obj = load_obj(input).expect("Failed to load obj");
+        let model: Obj = load_obj(input).expect("Failed to load obj");
 
         let (min, max) = model.vertices.iter().fold(
             (Vec3A::new(INFINITY, INFINITY, INFINITY), Vec3A::new(NEG_INFINITY, NEG_INFINITY, NEG_INFINITY)),
@@ -64,25 +74,17 @@ impl Mesh {
         let diff = (max - min).max_element(); // This is the greatest difference
         // We will scale the object so that the greatest difference is 1
         let scaling_factor: Vec3A = Vec3A::splat(diff).recip() * Vec3A::splat(scaling_factor);
-        let rotation_matrix: glam::Mat3A = 
-          glam::Mat3A::from_rotation_x(rotation[0].to_radians())
-        * glam::Mat3A::from_rotation_y(rotation[1].to_radians())
-        * glam::Mat3A::from_rotation_z(rotation[2].to_radians());
-        for vertex in model.vertices.iter_mut() {
-            let mut v: Vec3A = Vec3A::new(vertex.position[0], vertex.position[1], vertex.position[2]);
-            v = v * scaling_factor;
-            v = v + position;
-            v = rotation_matrix.mul(v);
-            vertex.position = [v.x, v.y, v.z];
-        }
+        let transform: Affine3A = Mesh::_build_transform(position, scaling_factor, rotation);
+        // We keep the transformed vertices as Vec3A so faces index them directly instead of rebuilding them per use
+        let vertices: Vec<Vec3A> = model.vertices.iter().map(|vertex| transform.transform_point3a(Vec3A::from(vertex.position))).collect();
 
         // ! This hasn't yet been tested, it's been copied from the stl loader, that one works
         // TODO: Test obj loader and see if normals are being computed correctly
-        let mut normals_hash: HashMap<usize, Vec3A> = HashMap::new();
+        let mut normals_hash: HashMap<usize, Vec3A> = HashMap::with_capacity(vertices.len());
         for face in model.indices.chunks(3) {
-            let v0: Vec3A = Vec3A::new(model.vertices[face[0] as usize].position[0], model.vertices[face[0] as usize].position[1], model.vertices[face[0] as usize].position[2]);
-            let v1: Vec3A = Vec3A::new(model.vertices[face[1] as usize].position[0], model.vertices[face[1] as usize].position[1], model.vertices[face[1] as usize].position[2]);
-            let v2: Vec3A = Vec3A::new(model.vertices[face[2] as usize].position[0], model.vertices[face[2] as usize].position[1], model.vertices[face[2] as usize].position[2]);
+            let v0: Vec3A = vertices[face[0] as usize];
+            let v1: Vec3A = vertices[face[1] as usize];
+            let v2: Vec3A = vertices[face[2] as usize];
             let normal: Vec3A = (v1 - v0).cross(v2 - v0).normalize();
             normals_hash.insert(face[0] as usize, normal);
             normals_hash.insert(face[1] as usize, normal);
@@ -90,11 +92,11 @@ impl Mesh {
         }
         // We then return the triangles
         (0..model.indices.len()).step_by(3).fold(
-            Vec::new(),
+            Vec::with_capacity(model.indices.len() / 3),
             |mut triangles, idx| {
-                let v0: Vec3A = Vec3A::new(model.vertices[model.indices[idx] as usize].position[0], model.vertices[model.indices[idx] as usize].position[1], model.vertices[model.indices[idx] as usize].position[2]);
-                let v1: Vec3A = Vec3A::new(model.vertices[model.indices[idx + 1] as usize].position[0], model.vertices[model.indices[idx + 1] as usize].position[1], model.vertices[model.indices[idx + 1] as usize].position[2]);
-                let v2: Vec3A = Vec3A::new(model.vertices[model.indices[idx + 2] as usize].position[0], model.vertices[model.indices[idx + 2] as usize].position[1], model.vertices[model.indices[idx + 2] as usize].position[2]);
+                let v0: Vec3A = vertices[model.indices[idx] as usize];
+                let v1: Vec3A = vertices[model.indices[idx + 1] as usize];
+                let v2: Vec3A = vertices[model.indices[idx + 2] as usize];
                 // Check whether the triangle is degenerate
                 // if (v0 - v1).length_squared() < EPSILON || (v1 - v2).length_squared() < EPSILON || (v2 - v0).length_squared() < EPSILON { return triangles; }
                 let n0: Vec3A = normals_hash[&(model.indices[idx] as usize)];
@@ -107,8 +109,10 @@ impl Mesh {
         )
     }
     fn _load_stl_triangles(position: Point3, scaling_factor: f32, rotation: Vec3A, filename: &str, material: Box<dyn Material>) -> Vec<Triangle> {
-        let mut stlfile = std::fs::OpenOptions::new().read(true).open(filename).unwrap();
-        let mut stl = stl_io::read_stl(&mut stlfile).unwrap();
+        let stlfile = std::fs::OpenOptions::new().read(true).open(filename).unwrap();
+        // Binary STL is read one small record at a time, so we buffer it instead of issuing a syscall per triangle
+        let mut input = std::io::BufReader::new(stlfile);
+        let stl = stl_io::read_stl(&mut input).unwrap();
         // let mut triangles: Vec<Triangle> = Vec::new();
         let (min, max) = stl.vertices.iter().fold(
             (Vec3A::new(INFINITY, INFINITY, INFINITY), Vec3A::new(NEG_INFINITY, NEG_INFINITY, NEG_INFINITY)),
@@ -119,23 +123,14 @@ impl Mesh {
         );
         let diff = (max - min).max_element(); // This is the greatest difference
         let scaling_factor: Vec3A = Vec3A::splat(diff).recip() * Vec3A::splat(scaling_factor);
-        let rotation_matrix: glam::Mat3A = 
-          glam::Mat3A::from_rotation_x(rotation[0].to_radians())
-        * glam::Mat3A::from_rotation_y(rotation[1].to_radians())
-        * glam::Mat3A::from_rotation_z(rotation[2].to_radians());
-        for vertex in stl.vertices.iter_mut() {
-            let mut v: Vec3A = Vec3A::new(vertex[0], vertex[1], vertex[2]);
-            v = v * scaling_factor;
-            v = v + position;
-            v = rotation_matrix.mul(v);
-            *vertex = Vector::new([v.x, v.y, v.z]);
-        }
+        let transform: Affine3A = Mesh::_build_transform(position, scaling_factor, rotation);
+        let vertices: Vec<Vec3A> = stl.vertices.iter().map(|vertex| transform.transform_point3a(Vec3A::new(vertex[0], vertex[1], vertex[2]))).collect();
         // Normals is an array of length equal to the number of vertices
-        let mut normals_hash: HashMap<usize, Vec3A> = HashMap::new();
+        let mut normals_hash: HashMap<usize, Vec3A> = HashMap::with_capacity(vertices.len());
         for face in stl.faces.iter() {
-            let v0: Vec3A = Vec3A::new(stl.vertices[face.vertices[0] as usize][0], stl.vertices[face.vertices[0] as usize][1], stl.vertices[face.vertices[0] as usize][2]);
-            let v1: Vec3A = Vec3A::new(stl.vertices[face.vertices[1] as usize][0], stl.vertices[face.vertices[1] as usize][1], stl.vertices[face.vertices[1] as usize][2]);
-            let v2: Vec3A = Vec3A::new(stl.vertices[face.vertices[2] as usize][0], stl.vertices[face.vertices[2] as usize][1], stl.vertices[face.vertices[2] as usize][2]);
+            let v0: Vec3A = vertices[face.vertices[0] as usize];
+            let v1: Vec3A = vertices[face.vertices[1] as usize];
+            let v2: Vec3A = vertices[face.vertices[2] as usize];
             let normal: Vec3A = ((v1 - v0).cross(v2 - v0)).normalize();
             for vertex in face.vertices.iter() {
                 let normal0: &mut Vec3A = normals_hash.entry(*vertex as usize).or_insert(Vec3A::ZERO);
@@ -146,9 +141,9 @@ impl Mesh {
 
         // We then return the triangles
         stl.faces.iter().map(|face|{
-            let v0: Vec3A = Vec3A::new(stl.vertices[face.vertices[0] as usize][0], stl.vertices[face.vertices[0] as usize][1], stl.vertices[face.vertices[0] as usize][2]);
-            let v1: Vec3A = Vec3A::new(stl.vertices[face.vertices[1] as usize][0], stl.vertices[face.vertices[1] as usize][1], stl.vertices[face.vertices[1] as usize][2]);
-            let v2: Vec3A = Vec3A::new(stl.vertices[face.vertices[2] as usize][0], stl.vertices[face.vertices[2] as usize][1], stl.vertices[face.vertices[2] as usize][2]);
+            let v0: Vec3A = vertices[face.vertices[0] as usize];
+            let v1: Vec3A = vertices[face.vertices[1] as usize];
+            let v2: Vec3A = vertices[face.vertices[2] as usize];
             let normals: Box<[Vec3A; 3]> = Box::new([
                 normals_hash[&(face.vertices[0] as usize)],
                 normals_hash[&(face.vertices[1] as usize)],
@@ -2,8 +2,10 @@
 // Date: 09/02/2023
 // Description: This file implements the parsing of YAML config files
 
-use std::sync::Arc;
+use std::collections::HashMap;
+use std::sync::{Arc, Mutex};
 
+use lazy_static::lazy_static;
 use yaml_rust::{YamlLoader, Yaml};
 
 use glam::Vec3A;
@@ -24,152 +26,173 @@ use crate::color::Color;
 use crate::point3::Point3;
 
 
+// Constants, camera and scene are all read from the same config file, so we keep each parsed document around
+lazy_static! { static ref YAML_DOCUMENTS: Mutex<HashMap<String, Arc<Yaml>>> = Mutex::new(HashMap::new()); }
+
 pub fn parse_yaml_constants(filename: &str) -> utility::Constants {
     if filename == "" { utility::Constants::default() }
     else {
-        let content: String = std::fs::read_to_string(filename).unwrap();
-        let docs: Vec<Yaml> = YamlLoader::load_from_str(&content).unwrap();
-        let hashconsts = docs[0].as_hash().unwrap()[&yaml_rust::Yaml::String("constants".to_string())].as_hash().unwrap().clone();
-        let width = hashconsts[&yaml_rust::Yaml::String("width".to_string())].as_i64().unwrap() as u32;
-        let height = hashconsts[&yaml_rust::Yaml::String("height".to_string())].as_i64().unwrap() as u32;
-        let samples_per_pixel = hashconsts[&yaml_rust::Yaml::String("samplesPerPixel".to_string())].as_i64().unwrap() as u32;
-        let max_depth = hashconsts[&yaml_rust::Yaml::String("maxDepth".to_string())].as_i64().unwrap() as u32;
-        let min_depth = hashconsts[&yaml_rust::Yaml::String("minDepth".to_string())].as_i64().unwrap() as u32;
-        let environment_map = {
-            if hashconsts.contains_key(&yaml_rust::Yaml::String("environmentMap".to_string())) {
-                Some(hashconsts[&yaml_rust::Yaml::String("environmentMap".to_string())].as_str().unwrap().to_string())
-            } else { None }
-        };
-        let environment_distance = {
-            if hashconsts.contains_key(&yaml_rust::Yaml::String("environmentDistance".to_string())) {
-                Some(hashconsts[&yaml_rust::Yaml::String("environmentDistance".to_string())].as_f64().unwrap() as f32)
-            } else { None }
-        };
-        let environment_intensity = {
-            if hashconsts.contains_key(&yaml_rust::Yaml::String("environmentIntensity".to_string())) {
-                Some(hashconsts[&yaml_rust::Yaml::String("environmentIntensity".to_string())].as_f64().unwrap() as f32)
-            } else { None }
-        };
-        let filter: Option<String> = {
-            if hashconsts.contains_key(&yaml_rust::Yaml::String("filter".to_string())) {
-                Some(hashconsts[&yaml_rust::Yaml::String("filter".to_string())].as_str().unwrap().to_string())
-            } else { None }
-        };
+        let doc: Arc<Yaml> = _load_yaml_document(filename);
+        let hashconsts = _get_hash(doc.as_hash().unwrap(), "constants");
+        let width = _get_u32(hashconsts, "width");
+        let height = _get_u32(hashconsts, "height");
+        let samples_per_pixel = _get_u32(hashconsts, "samplesPerPixel");
+        let max_depth = _get_u32(hashconsts, "maxDepth");
+        let min_depth = _get_u32(hashconsts, "minDepth");
+        let environment_map: Option<String> = _get_optional(hashconsts, "environmentMap").map(|map| map.as_str().unwrap().to_string());
+        let environment_distance: Option<f32> = _get_optional(hashconsts, "environmentDistance").map(_as_f32);
+        let environment_intensity: Option<f32> = _get_optional(hashconsts, "environmentIntensity").map(_as_f32);
+        let filter: Option<String> = _get_optional(hashconsts, "filter").map(|filter| filter.as_str().unwrap().to_string());
         let aspect_ratio = width as f32 / height as f32;
         utility::Constants { width, height, aspect_ratio, samples_per_pixel, max_depth, min_depth, environment_map, environment_distance, environment_intensity, filter }
     }
 }
 
 pub fn parse_yaml_camera(filename: &str) -> Camera {
-    let content: String = std::fs::read_to_string(filename).unwrap();
-    let docs: Vec<Yaml> = YamlLoader::load_from_str(&content).unwrap();
-    let hashcam = docs[0].as_hash().unwrap()[&yaml_rust::Yaml::String("camera".to_string())].as_hash().unwrap().clone();
-    let lookfrom = hashcam[&yaml_rust::Yaml::String("lookFrom".to_string())].as_vec().unwrap();
-    let lookat = hashcam[&yaml_rust::Yaml::String("lookAt".to_string())].as_vec().unwrap();
-    let vup = hashcam[&yaml_rust::Yaml::String("vup".to_string())].as_vec().unwrap();
-    let vfov = hashcam[&yaml_rust::Yaml::String("vfov".to_string())].as_f64().unwrap();
-    let aspect_ratio = hashcam[&yaml_rust::Yaml::String("aspectRatio".to_string())].as_f64().unwrap();
-    let aperture = hashcam[&yaml_rust::Yaml::String("aperture".to_string())].as_f64().unwrap();
-    let focus_dist = hashcam[&yaml_rust::Yaml::String("focusDistance".to_string())].as_f64().unwrap();
+    let doc: Arc<Yaml> = _load_yaml_document(filename);
+    let hashcam = _get_hash(doc.as_hash().unwrap(), "camera");
+    let lookfrom = _get_vec3(hashcam, "lookFrom");
+    let lookat = _get_vec3(hashcam, "lookAt");
+    let vup = _get_vec3(hashcam, "vup");
+    let vfov = _get_f32(hashcam, "vfov");
+    let aspect_ratio = _get_f32(hashcam, "aspectRatio");
+    let aperture = _get_f32(hashcam, "aperture");
+    let focus_dist = _get_f32(hashcam, "focusDistance");
     Camera::new(
-        &Vec3A::new(lookfrom[0].as_f64().unwrap() as f32, lookfrom[1].as_f64().unwrap() as f32, lookfrom[2].as_f64().unwrap() as f32),
-        &Vec3A::new(lookat[0].as_f64().unwrap() as f32, lookat[1].as_f64().unwrap() as f32, lookat[2].as_f64().unwrap() as f32),
-        &Vec3A::new(vup[0].as_f64().unwrap() as f32, vup[1].as_f64().unwrap() as f32, vup[2].as_f64().unwrap() as f32),
-        vfov as f32,
-        aspect_ratio as f32,
-        aperture as f32,
-        focus_dist as f32
+        &lookfrom,
+        &lookat,
+        &vup,
+        vfov,
+        aspect_ratio,
+        aperture,
+        focus_dist
     )
 }
 
 pub fn parse_yaml_scene(filename: &str) -> HittableList {
-    let mut world: HittableList = HittableList::new();
-    let content: String = std::fs::read_to_string(filename).unwrap();
-    let docs: Vec<Yaml> = YamlLoader::load_from_str(&content).unwrap();
-    let hashworld = docs[0].as_hash().unwrap()[&yaml_rust::Yaml::String("world".to_string())].as_vec().unwrap();
-    for hashobj in hashworld {
+    let doc: Arc<Yaml> = _load_yaml_document(filename);
+    let hashworld = _get_vec(doc.as_hash().unwrap(), "world");
+    // Every entry yields exactly one object, so collecting from the list allocates the world once with the right size
+    let world: HittableList = hashworld.iter().map(|hashobj| {
         let hashobj = hashobj.as_hash().unwrap();
-        let objtype = hashobj[&yaml_rust::Yaml::String("objType".to_string())].as_str().unwrap();
-        if !objtype.contains("Array") {
-            let material: Box<dyn Material + Send + Sync> = _parse_material(hashobj);
-            let obj: Arc<dyn Hittable + Send + Sync> = _parse_geometry(hashobj, material);
-            world.push(obj);
-        } else if objtype.contains("Sphere") {
-            // * SphereArray *
-            // ! In future we will support other objects
-            let objects = hashobj[&yaml_rust::Yaml::String("objects".to_string())].as_vec().unwrap();
-            let mut spheres: Vec<Sphere> = Vec::<Sphere>::new();
-            for obj in objects {
-                let obj = obj.as_hash().unwrap();
-                let objtype = obj[&yaml_rust::Yaml::String("objType".to_string())].as_str().unwrap();
-                if objtype == "Sphere" {
-                    let center = obj[&yaml_rust::Yaml::String("center".to_string())].as_vec().unwrap();
-                    let radius = obj[&yaml_rust::Yaml::String("radius".to_string())].as_f64().unwrap();
-                    let material = _parse_material(obj);
-                    spheres.push(Sphere::new(Point3::new(center[0].as_f64().unwrap() as f32, center[1].as_f64().unwrap() as f32, center[2].as_f64().unwrap() as f32), radius as f32, material, 0));
-                }
-            }
-            let spherearray = SphereArray::new(&mut spheres);
-            world.push(Arc::new(spherearray));
-        } else { panic!("Unsupported object type: {}", objtype) }
-    }
+        let objtype = _get_str(hashobj, "objType");
+        // Dispatch on the object type once, every handler builds a complete world entry
+        let obj: Arc<dyn Hittable + Send + Sync> = match objtype {
+            "Array:Sphere" => _parse_sphere_array(hashobj),
+            _ if objtype.contains("Array") => panic!("Unsupported object type: {}", objtype),
+            _ => _parse_geometry(hashobj, _parse_material(hashobj)),
+        };
+        obj
+    }).collect();
     world
 }
 
+fn _load_yaml_document(filename: &str) -> Arc<Yaml> {
+    let mut documents = YAML_DOCUMENTS.lock().unwrap();
+    documents.entry(filename.to_string()).or_insert_with(|| {
+        // Only the first document of the config file is used, so we take it out of the loaded vector instead of cloning it
+        let content: String = std::fs::read_to_string(filename).unwrap();
+        Arc::new(YamlLoader::load_from_str(&content).unwrap().swap_remove(0))
+    }).clone()
+}
+
+fn _parse_sphere_array(hashobj: &yaml_rust::yaml::Hash) -> Arc<dyn Hittable + Send + Sync> {
+    // ! In future we will support other objects
+    let objects = _get_vec(hashobj, "objects");
+    let mut spheres: Vec<Sphere> = Vec::<Sphere>::with_capacity(objects.len());
+    for obj in objects {
+        let obj = obj.as_hash().unwrap();
+        let objtype = _get_str(obj, "objType");
+        if objtype == "Sphere" {
+            let center: Point3 = _get_vec3(obj, "center");
+            let radius = _get_f32(obj, "radius");
+            let material = _parse_material(obj);
+            spheres.push(Sphere::new(center, radius, material, 0));
+        }
+    }
+    Arc::new(SphereArray::new(spheres))
+}
+
+// Typed accessors for the fields of the config schema, each key is looked up and converted in a single place
+fn _get_optional<'a>(hash: &'a yaml_rust::yaml::Hash, key: &str) -> Option<&'a Yaml> { hash.get(&Yaml::String(key.to_string())) }
+fn _get<'a>(hash: &'a yaml_rust::yaml::Hash, key: &str) -> &'a Yaml {
+    _get_optional(hash, key).unwrap_or_else(|| panic!("Missing key in config: {}", key))
+}
+fn _get_hash<'a>(hash: &'a yaml_rust::yaml::Hash, key: &str) -> &'a yaml_rust::yaml::Hash { _get(hash, key).as_hash().unwrap() }
+fn _get_vec<'a>(hash: &'a yaml_rust::yaml::Hash, key: &str) -> &'a Vec<Yaml> { _get(hash, key).as_vec().unwrap() }
+fn _get_str<'a>(hash: &'a yaml_rust::yaml::Hash, key: &str) -> &'a str { _get(hash, key).as_str().unwrap() }
+fn _get_u32(hash: &yaml_rust::yaml::Hash, key: &str) -> u32 { _get(hash, key).as_i64().unwrap() as u32 }
+fn _get_f32(hash: &yaml_rust::yaml::Hash, key: &str) -> f32 { _as_f32(_get(hash, key)) }
+fn _get_vec3(hash: &yaml_rust::yaml::Hash, key: &str) -> Vec3A { _parse_vec3(_get(hash, key)) }
+
+fn _parse_vec3(yaml: &Yaml) -> Vec3A {
+    // Converts a YAML list of three numbers into a vector once, so callers don't index and cast it repeatedly
+    let list = yaml.as_vec().unwrap();
+    Vec3A::new(_as_f32(&list[0]), _as_f32(&list[1]), _as_f32(&list[2]))
+}
+
+fn _as_f32(yaml: &Yaml) -> f32 {
+    // YAML loads numbers without a decimal point as integers, for which as_f64 returns None
+    match yaml {
+        Yaml::Integer(value) => *value as f32,
+        _ => yaml.as_f64().unwrap() as f32,
+    }
+}
+
 fn _parse_material(hashobj: &yaml_rust::yaml::Hash) -> Box<dyn Material + Send + Sync> {
-    let objmat = hashobj[&yaml_rust::Yaml::String("material".to_string())].as_hash().unwrap();
-    let objmattype = objmat[&yaml_rust::Yaml::String("matType".to_string())].as_str().unwrap();
+    let objmat = _get_hash(hashobj, "material");
+    let objmattype = _get_str(objmat, "matType");
     match objmattype {
         "Lambertian" => { Box::new(Lambertian::new_texture(_parse_texture(objmat))) },
         "Metal" => {
             // has an albedo and a fuzz
-            let fuzz = objmat[&yaml_rust::Yaml::String("fuzz".to_string())].as_f64().unwrap();
-            Box::new(Metal::new_texture(_parse_texture(objmat), fuzz as f32))
+            let fuzz = _get_f32(objmat, "fuzz");
+            Box::new(Metal::new_texture(_parse_texture(objmat), fuzz))
         },
         "Dielectric" => {
             // has just an index of refraction
-            let ior = objmat[&yaml_rust::Yaml::String("refractionIdx".to_string())].as_f64().unwrap();
-            Box::new(Dielectric::new_texture(_parse_texture(objmat), ior as f32))
+            let ior = _get_f32(objmat, "refractionIdx");
+            Box::new(Dielectric::new_texture(_parse_texture(objmat), ior))
         },
         "Plastic" => {
             // has an albedo, a reflectivity and a fuzz
-            let fuzz = objmat[&yaml_rust::Yaml::String("fuzz".to_string())].as_f64().unwrap();
-            let reflectivity = objmat[&yaml_rust::Yaml::String("reflectivity".to_string())].as_f64().unwrap();
-            Box::new(Plastic::new_texture(_parse_texture(objmat), reflectivity as f32, fuzz as f32))
+            let fuzz = _get_f32(objmat, "fuzz");
+            let reflectivity = _get_f32(objmat, "reflectivity");
+            Box::new(Plastic::new_texture(_parse_texture(objmat), reflectivity, fuzz))
         },
         "GGX" => {
             // has an albedo, a roughness and a fuzz
-            let reflectivity = objmat[&yaml_rust::Yaml::String("reflectivity".to_string())].as_f64().unwrap();
-            let roughness = objmat[&yaml_rust::Yaml::String("roughness".to_string())].as_f64().unwrap();
-            Box::new(GGXGlossy::new_texture(_parse_texture(objmat), roughness as f32, reflectivity as f32))
+            let reflectivity = _get_f32(objmat, "reflectivity");
+            let roughness = _get_f32(objmat, "roughness");
+            Box::new(GGXGlossy::new_texture(_parse_texture(objmat), roughness, reflectivity))
         }
         "DiffuseLight" => {
             // has just an emittance
-            let intensity = objmat[&yaml_rust::Yaml::String("intensity".to_string())].as_f64().unwrap();
-            Box::new(DiffuseLight::new_texture(_parse_texture(objmat), intensity as f32))
+            let intensity = _get_f32(objmat, "intensity");
+            Box::new(DiffuseLight::new_texture(_parse_texture(objmat), intensity))
         },
         _ => { panic!("Unknown material type: {:?}", objmat); }
     }
 }
 
 fn _parse_texture(objmat: &yaml_rust::yaml::Hash) -> Box<dyn Texture + Send + Sync> {
-    let textype = objmat[&yaml_rust::Yaml::String("texType".to_string())].as_str().unwrap();
-    let hashtex = objmat[&yaml_rust::Yaml::String("texture".to_string())].as_hash().unwrap();
+    let textype = _get_str(objmat, "texType");
+    let hashtex = _get_hash(objmat, "texture");
     match textype {
         "SolidColor" => {
             // albedo is inside of the hash of SolidColor
-            let albedo = hashtex[&yaml_rust::Yaml::String("albedo".to_string())].as_vec().unwrap();
-            Box::new(SolidColor::new(Color::new(albedo[0].as_f64().unwrap() as f32, albedo[1].as_f64().unwrap() as f32, albedo[2].as_f64().unwrap() as f32)))
+            let albedo: Color = _get_vec3(hashtex, "albedo");
+            Box::new(SolidColor::new(albedo))
         },
         "ChessBoard" => {
             // Contains two textures and a scale
-            let tex1 = _parse_texture(hashtex[&yaml_rust::Yaml::String("tex1".to_string())].as_hash().unwrap());
-            let tex2 = _parse_texture(hashtex[&yaml_rust::Yaml::String("tex2".to_string())].as_hash().unwrap());
-            let scale = hashtex[&yaml_rust::Yaml::String("scale".to_string())].as_f64().unwrap();
-            Box::new(ChessBoard::new(tex1, tex2, scale as f32))
+            let tex1 = _parse_texture(_get_hash(hashtex, "tex1"));
+            let tex2 = _parse_texture(_get_hash(hashtex, "tex2"));
+            let scale = _get_f32(hashtex, "scale");
+            Box::new(ChessBoard::new(tex1, tex2, scale))
         },
         "ImageTexture" => {
-            let filename = hashtex[&yaml_rust::Yaml::String("filename".to_string())].as_str().unwrap();
+            let filename = _get_str(hashtex, "filename");
             Box::new(ImageTexture::new(filename))
         }
         _ => { panic!("Unsupported texture type: {}", textype) }
@@ -177,82 +200,82 @@ fn _parse_texture(objmat: &yaml_rust::yaml::Hash) -> Box<dyn Texture + Send + Sy
 }
 
 fn _parse_geometry(hashobj: &yaml_rust::yaml::Hash, material: Box<dyn Material>) -> Arc<dyn Hittable + Send + Sync> {
-    let objtype = hashobj[&yaml_rust::Yaml::String("objType".to_string())].as_str().unwrap();
+    let objtype = _get_str(hashobj, "objType");
     match objtype {
         "Sphere" => {
             // has a center and radius
-            let center = hashobj[&yaml_rust::Yaml::String("center".to_string())].as_vec().unwrap();
-            let radius = hashobj[&yaml_rust::Yaml::String("radius".to_string())].as_f64().unwrap();
-            Arc::new(Sphere::new(Point3::new(center[0].as_f64().unwrap() as f32, center[1].as_f64().unwrap() as f32, center[2].as_f64().unwrap() as f32), radius as f32, material, 0))
+            let center: Point3 = _get_vec3(hashobj, "center");
+            let radius = _get_f32(hashobj, "radius");
+            Arc::new(Sphere::new(center, radius, material, 0))
         },
         "XYRectangle" => {
             // has a position, width and height
-            let position = hashobj[&yaml_rust::Yaml::String("position".to_string())].as_vec().unwrap();
-            let width = hashobj[&yaml_rust::Yaml::String("width".to_string())].as_f64().unwrap();
-            let height = hashobj[&yaml_rust::Yaml::String("height".to_string())].as_f64().unwrap();
+            let position: Point3 = _get_vec3(hashobj, "position");
+            let half_width = _get_f32(hashobj, "width") / 2.0;
+            let half_height = _get_f32(hashobj, "height") / 2.0;
             Arc::new(XYRectangle::new(
-                position[0].as_f64().unwrap() as f32 - width as f32 / 2.0,
-                position[0].as_f64().unwrap() as f32 + width as f32 / 2.0,
-                position[1].as_f64().unwrap() as f32 - height as f32 / 2.0,
-                position[1].as_f64().unwrap() as f32 + height as f32 / 2.0,
-                position[2].as_f64().unwrap() as f32,
+                position.x - half_width,
+                position.x + half_width,
+                position.y - half_height,
+                position.y + half_height,
+                position.z,
                 material,
                 0
             ))
         },
         "XZRectangle" => {
             // has a position, width and height
-            let position = hashobj[&yaml_rust::Yaml::String("position".to_string())].as_vec().unwrap();
-            let width = hashobj[&yaml_rust::Yaml::String("width".to_string())].as_f64().unwrap();
-            let height = hashobj[&yaml_rust::Yaml::String("height".to_string())].as_f64().unwrap();
+            let position: Point3 = _get_vec3(hashobj, "position");
+            let half_width = _get_f32(hashobj, "width") / 2.0;
+            let half_height = _get_f32(hashobj, "height") / 2.0;
             Arc::new(XZRectangle::new(
-                position[0].as_f64().unwrap() as f32 - width as f32 / 2.0,
-                position[0].as_f64().unwrap() as f32 + width as f32 / 2.0,
-                position[2].as_f64().unwrap() as f32 - height as f32 / 2.0,
-                position[2].as_f64().unwrap() as f32 + height as f32 / 2.0,
-                position[1].as_f64().unwrap() as f32,
+                position.x - half_width,
+                position.x + half_width,
+                position.z - half_height,
+                position.z + half_height,
+                position.y,
                 material,
                 0
             ))
         },
         "YZRectangle" => {
             // has a position, width and height
-            let position = hashobj[&yaml_rust::Yaml::String("position".to_string())].as_vec().unwrap();
-            let width = hashobj[&yaml_rust::Yaml::String("width".to_string())].as_f64().unwrap();
-            let height = hashobj[&yaml_rust::Yaml::String("height".to_string())].as_f64().unwrap();
+            let position: Point3 = _get_vec3(hashobj, "position");
+            let half_width = _get_f32(hashobj, "width") / 2.0;
+            let half_height = _get_f32(hashobj, "height") / 2.0;
             Arc::new(YZRectangle::new(
-                position[1].as_f64().unwrap() as f32 - width as f32 / 2.0,
-                position[1].as_f64().unwrap() as f32 + width as f32 / 2.0,
-                position[2].as_f64().unwrap() as f32 - height as f32 / 2.0,
-                position[2].as_f64().unwrap() as f32 + height as f32 / 2.0,
-                position[0].as_f64().unwrap() as f32,
+                position.y - half_width,
+                position.y + half_width,
+                position.z - half_height,
+                position.z + half_height,
+                position.x,
                 material,
                 0
             ))
         },
         "Box" => {
             // has a position, width and height and depth
-            let position = hashobj[&yaml_rust::Yaml::String("position".to_string())].as_vec().unwrap();
-            let width = hashobj[&yaml_rust::Yaml::String("width".to_string())].as_f64().unwrap();
-            let height = hashobj[&yaml_rust::Yaml::String("height".to_string())].as_f64().unwrap();
-            let depth = hashobj[&yaml_rust::Yaml::String("depth".to_string())].as_f64().unwrap();
+            let position: Point3 = _get_vec3(hashobj, "position");
+            let width = _get_f32(hashobj, "width");
+            let height = _get_f32(hashobj, "height");
+            let depth = _get_f32(hashobj, "depth");
             Arc::new(BBox::new(
-                Vec3A::new(position[0].as_f64().unwrap() as f32, position[1].as_f64().unwrap() as f32, position[2].as_f64().unwrap() as f32),
-                Vec3A::new(width as f32, height as f32, depth as f32),
+                position,
+                Vec3A::new(width, height, depth),
                 material
             ))
         }
         "Mesh" => {
             // has a filename, position, rotation and scale
-            let filename = hashobj[&yaml_rust::Yaml::String("filename".to_string())].as_str().unwrap();
-            let position = hashobj[&yaml_rust::Yaml::String("position".to_string())].as_vec().unwrap();
-            let rotation = hashobj[&yaml_rust::Yaml::String("rotation".to_string())].as_vec().unwrap();
-            let scale = hashobj[&yaml_rust::Yaml::String("scalingFactor".to_string())].as_f64().unwrap();
+            let filename = _get_str(hashobj, "filename");
+            let position: Point3 = _get_vec3(hashobj, "position");
+            let rotation: Vec3A = _get_vec3(hashobj, "rotation");
+            let scale = _get_f32(hashobj, "scalingFactor");
             Arc::new(
                 Mesh::new(
-                    Vec3A::new(position[0].as_f64().unwrap() as f32, position[1].as_f64().unwrap() as f32, position[2].as_f64().unwrap() as f32),
-                    scale as f32,
-                    Vec3A::new(rotation[0].as_f64().unwrap() as f32, rotation[1].as_f64().unwrap() as f32, rotation[2].as_f64().unwrap() as f32),
+                    position,
+                    scale,
+                    rotation,
                     filename,
                     material
                 )
@@ -261,3 +284,15 @@ fn _parse_geometry(hashobj: &yaml_rust::yaml::Hash, material: Box<dyn Material>)
         _ => { panic!("Unknown object type: {}", objtype); }
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_parse_vec3_mixed_numbers() -> Result<(), std::fmt::Error> {
+        let docs: Vec<Yaml> = YamlLoader::load_from_str("[1, 2.5, -3]").unwrap();
+        assert_eq!(_parse_vec3(&docs[0]), Vec3A::new(1.0, 2.5, -3.0));
+        Ok(())
+    }
+}
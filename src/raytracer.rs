@@ -2,7 +2,7 @@
 // Date: 24/01/2023
 // Description: This file implements various raytracing functions
 
-use std::sync::{Arc, Mutex};
+use std::sync::Arc;
 use core::sync::atomic::{AtomicU32, Ordering};
 
 use likely_stable::unlikely;
@@ -41,11 +41,12 @@ pub fn render_to_image(world: &HittableList, cam: &Camera, filename: &str) {
     let filter: Box<dyn Filter + Send + Sync> = load_filter();
     println!("Lights: {}", lights.len());
     println!("Chosen Filter: {}", filter);
+    let (height, inv_width, inv_height) = _pixel_scales();
     for (x, y, pixel) in img.enumerate_pixels_mut() {
         let mut pixel_color: Color = Color::new(0.0, 0.0, 0.0);
         for _s in 0..CONSTS.samples_per_pixel {
-            let u: f32 = (x as f32 + filter.sample(random_f32())) / (CONSTS.width as f32 - 1.0);
-            let v: f32 = (CONSTS.height as f32 - (y as f32 + filter.sample(random_f32()))) as f32 / (CONSTS.height as f32 - 1.0);
+            let u: f32 = (x as f32 + filter.sample(random_f32())) * inv_width;
+            let v: f32 = (height - (y as f32 + filter.sample(random_f32()))) * inv_height;
             let r: Ray = cam.get_ray(u, v);
             pixel_color = pixel_color + ray_color(&r, world, &lights, &envmap, 0);
         }
@@ -56,35 +57,45 @@ pub fn render_to_image(world: &HittableList, cam: &Camera, filename: &str) {
 }
 
 pub fn render_to_image_multithreaded(world: &HittableList, cam: Camera, filename: &str) {
-    let img: ImageBuffer<Rgb<u8>, Vec<u8>> = ImageBuffer::new(CONSTS.width, CONSTS.height);
-    let safe_img = Arc::new(Mutex::new(img));
+    // Rows of a packed RGB buffer, each one is written by a single worker so no lock is taken per pixel
+    let row_size: usize = CONSTS.width as usize * 3;
+    let mut pixels: Vec<u8> = vec![0; row_size * CONSTS.height as usize];
     let environment_map: Arc<dyn Hittable + Send + Sync> = load_environment();
-    let safe_world = Arc::new(world.clone());
-    let mut lights = get_lights(&world);
+    // The world is only read while rendering, so the worker threads share the caller's list instead of a cloned copy
+    let mut lights = get_lights(world);
     if CONSTS.environment_intensity.unwrap_or(1.0) > 0.0 { lights.push(environment_map.clone()); }
     let filter: Box<dyn Filter + Send + Sync> = load_filter();
     println!("Lights: {}", lights.len());
     println!("Chosen Filter: {}", filter);
     let total_rows = CONSTS.height as f32;
     let completed_rows = AtomicU32::new(0);
-    (0..CONSTS.height).into_par_iter().for_each(|y| {
-        for x in 0..CONSTS.width {
+    let (height, inv_width, inv_height) = _pixel_scales();
+    pixels.par_chunks_mut(row_size).enumerate().for_each(|(y, row)| {
+        for (x, pixel) in row.chunks_exact_mut(3).enumerate() {
             let mut pixel_color: Color = Color::new(0.0, 0.0, 0.0);
             for _s in 0..CONSTS.samples_per_pixel {
-                let u: f32 = (x as f32 + filter.sample(random_f32())) / (CONSTS.width as f32 - 1.0);
-                let v: f32 = (CONSTS.height as f32 - (y as f32 + filter.sample(random_f32()))) / (CONSTS.height as f32 - 1.0);
+                let u: f32 = (x as f32 + filter.sample(random_f32())) * inv_width;
+                let v: f32 = (height - (y as f32 + filter.sample(random_f32()))) * inv_height;
                 let r: Ray = cam.get_ray(u, v);
-                pixel_color += ray_color(&r, &*safe_world, &lights, &environment_map, 0);
+                pixel_color += ray_color(&r, world, &lights, &environment_map, 0);
             }
             let rgb: Rgb<u8> = to_rgb(pixel_color, CONSTS.samples_per_pixel as f32);
-            let mut img = safe_img.lock().unwrap();
-            img.put_pixel(x, y as u32, rgb);
+            pixel.copy_from_slice(&rgb.0);
         }
         completed_rows.fetch_add(1, Ordering::Relaxed);
         print!("{:.2}% complete\r", completed_rows.load(Ordering::Relaxed) as f32 / total_rows * 100.0);
     });
     // Save the image
-    safe_img.lock().unwrap().save(filename).unwrap();
+    let img: ImageBuffer<Rgb<u8>, Vec<u8>> = ImageBuffer::from_raw(CONSTS.width, CONSTS.height, pixels).unwrap();
+    img.save(filename).unwrap();
+}
+
+// Returns the image height and the reciprocals used to map pixel coordinates to [0, 1]
+// These are hoisted out of the per-sample loop so it doesn't go through CONSTS and divide for every ray
+fn _pixel_scales() -> (f32, f32, f32) {
+    let width: f32 = CONSTS.width as f32;
+    let height: f32 = CONSTS.height as f32;
+    (height, 1.0 / (width - 1.0), 1.0 / (height - 1.0))
 }
 
 // Returns the color of a ray
@@ -192,7 +203,7 @@ fn _add_random_world_spheres(world: &mut HittableList) -> Result<(), std::io::Er
             }
         }
     }
-    let spheres_arr: SphereArray = SphereArray::new(&mut spheres);
+    let spheres_arr: SphereArray = SphereArray::new(spheres);
     world.push(Arc::new(spheres_arr));
     Ok(())
 }
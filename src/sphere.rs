@@ -33,8 +33,10 @@ impl Sphere {
     pub fn new(center: Point3, radius: f32, material: Box<dyn Material>, node_index: usize) -> Sphere { Sphere { center, radius, material, node_index } }
     fn _get_sphere_uv(&self, p: &Vec3A) -> (f32, f32) {
         let unit_p: Vec3A = (*p - self.center) / self.radius;
-        (((-unit_p.z).atan2(unit_p.x) + utility::PI) / (2.0 * utility::PI), ((-unit_p.y).acos()) / utility::PI)
+        // Rounding can push unit_p.y slightly outside [-1, 1], where acos would return NaN
+        (((-unit_p.z).atan2(unit_p.x) + utility::PI) / (2.0 * utility::PI), ((-unit_p.y).clamp(-1.0, 1.0).acos()) / utility::PI)
     }
+    fn _cos_theta_max(&self, distance_squared: f32) -> f32 { (1.0 - (self.radius * self.radius) / distance_squared).max(0.0) }
 }
 
 impl Bounded for Sphere {
@@ -84,14 +86,14 @@ impl Hittable for Sphere {
     fn pdf_value(&self, origin: &Point3, _: &Vec3A) -> f32 {
         let sphere_center_to_camera: Vec3A = *origin - self.center;
         let distance_to_camera_squared: f32 = sphere_center_to_camera.length_squared();
-        let cos_theta_max: f32 = ((1.0 - (self.radius * self.radius)) / distance_to_camera_squared).max(0.0);
+        let cos_theta_max: f32 = self._cos_theta_max(distance_to_camera_squared);
         let solid_angle: f32 = 2.0 * utility::PI * (1.0 - cos_theta_max);
         1.0 / solid_angle
     }
     fn random(&self, origin: &Point3) -> Vec3A {
         let sphere_center_to_camera: Vec3A = *origin - self.center;
         let distance_to_camera_squared: f32 = sphere_center_to_camera.length_squared();
-        let cos_theta_max: f32 = (1.0 - (self.radius * self.radius) / (distance_to_camera_squared)).max(0.0);
+        let cos_theta_max: f32 = self._cos_theta_max(distance_to_camera_squared);
         // let sin_theta_max: f32 = (1.0 - cos_theta_max*cos_theta_max).sqrt();
         let phi: f32 = utility::random_f32_range(0.0, 2.0 * utility::PI);
         let cos_theta: f32 = utility::random_f32_range(cos_theta_max, 1.0);
@@ -117,4 +119,21 @@ mod tests {
         assert!(sphere.hit(&ray, 0.0, 100.0).is_some());
         Ok(())
     }
+    #[test]
+    fn test_sphere_pdf_value() -> Result<(), std::fmt::Error> {
+        // The pdf has to match the cone that random() samples from
+        let sphere: Sphere = Sphere::new(Point3::new(0.0, 0.0, 0.0), 1.0, Box::new(Lambertian::new(Color::new(0.0, 0.0, 0.0))), 0);
+        let pdf: f32 = sphere.pdf_value(&Point3::new(0.0, 0.0, 2.0), &Vec3A::new(0.0, 0.0, -1.0));
+        assert!((pdf - 2.0 / utility::PI).abs() <= utility::EPSILON);
+        Ok(())
+    }
+    #[test]
+    fn test_sphere_uv_at_poles() -> Result<(), std::fmt::Error> {
+        let sphere: Sphere = Sphere::new(Point3::new(0.0, 0.0, 0.0), 0.5, Box::new(Lambertian::new(Color::new(0.0, 0.0, 0.0))), 0);
+        let (_, v) = sphere._get_sphere_uv(&Point3::new(0.0, 0.50001, 0.0));
+        assert!((v - 1.0).abs() <= utility::EPSILON);
+        let (_, v) = sphere._get_sphere_uv(&Point3::new(0.0, -0.50001, 0.0));
+        assert!(v.abs() <= utility::EPSILON);
+        Ok(())
+    }
 }
@@ -30,8 +30,7 @@ unsafe impl Send for SphereArray {}
 
 impl SphereArray {
     #[allow(dead_code)]
-    pub fn new(spheres: &mut Vec<Sphere>) -> SphereArray {
-        let mut spheres: Vec<Sphere> = spheres.clone();
+    pub fn new(mut spheres: Vec<Sphere>) -> SphereArray {
         let bvh: BVH = BVH::build(&mut spheres);
         SphereArray { spheres, bvh, node_index: 0 }
     }
@@ -82,7 +81,7 @@ mod tests {
         let mut spheres: Vec<Sphere> = Vec::new();
         spheres.push(Sphere::new(Point3::new(0.0, 0.0, -1.0), 0.5, Box::new(Lambertian::new(Color::new(0.1, 0.2, 0.5))), 0));
         spheres.push(Sphere::new(Point3::new(0.0, -100.5, -1.0), 100.0, Box::new(Lambertian::new(Color::new(0.8, 0.8, 0.0))), 0));
-        let sphere_array: SphereArray = SphereArray::new(&mut spheres);
+        let sphere_array: SphereArray = SphereArray::new(spheres);
         let r: Ray = Ray::new(Point3::new(0.0, 0.0, 0.0), Point3::new(0.0, 0.0, -1.0));
         assert!(sphere_array.hit(&r, 0.0, 100.0).is_some());
         Ok(())
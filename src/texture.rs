@@ -1,12 +1,20 @@
+use std::collections::HashMap;
 use std::fmt::Debug;
-use std::sync::Arc;
+use std::sync::{Arc, Mutex};
 
 use dyn_clone::DynClone;
-use image::{GenericImageView, DynamicImage};
+use image::RgbImage;
+use lazy_static::lazy_static;
 
 use crate::point3::Point3;
 use crate::color::Color;
 
+// Scale used to map 8-bit channels to [0, 1]
+const COLOR_SCALE: f32 = 1.0 / 255.0;
+
+// Decoded images by filename, so textures referring to the same file share a single buffer
+lazy_static! { static ref IMAGE_CACHE: Mutex<HashMap<String, Arc<RgbImage>>> = Mutex::new(HashMap::new()); }
+
 
 pub trait Texture: DynClone + Debug + Send + Sync {
     fn value(&self, u: f32, v: f32, p: &Point3) -> Color;
@@ -97,7 +105,7 @@ impl Texture for GradientColor {
 /****************** Image Texture ******************/
 /****************** Environment Map Texture ******************/
 pub struct ImageTexture {
-    image: Arc<DynamicImage>,
+    image: Arc<RgbImage>,
     width: u32,
     height: u32,
 }
@@ -105,10 +113,13 @@ pub type EnvironmentMapTexture = ImageTexture;
 
 impl ImageTexture {
     pub fn new(filename: &str) -> ImageTexture {
-        println!("Loading image texture from file: {}", filename);
-        let image = image::open(filename).unwrap();
+        let image: Arc<RgbImage> = IMAGE_CACHE.lock().unwrap().entry(filename.to_string()).or_insert_with(|| {
+            println!("Loading image texture from file: {}", filename);
+            // We only ever sample RGB, so the image is decoded once into a tightly packed 8-bit buffer
+            Arc::new(image::open(filename).unwrap().into_rgb8())
+        }).clone();
         let (width, height) = image.dimensions();
-        ImageTexture { image: Arc::new(image), width, height }
+        ImageTexture { image, width, height }
     }
 }
 
@@ -138,9 +149,8 @@ impl Texture for ImageTexture {
         let v = 1.0 - v.clamp(0.0, 1.0);
         let i = ((u * self.width as f32) as u32).min(self.width - 1);
         let j = ((v * self.height as f32) as u32).min(self.height - 1);
-        let color_scale = 1.0 / 255.0;
         let pixel = self.image.get_pixel(i, j);
         //println!("Pixel: {:?} at position [{}, {}]", pixel, i, j);
-        Color::new(pixel[0] as f32 * color_scale, pixel[1] as f32 * color_scale, pixel[2] as f32 * color_scale)
+        Color::new(pixel[0] as f32, pixel[1] as f32, pixel[2] as f32) * COLOR_SCALE
     }
 }
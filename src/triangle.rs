@@ -57,10 +57,11 @@ fn _check_repair_normals(vertices: &mut Box<[Point3; 3]>, normals: &mut Box<[Vec
     if normals[0].length_squared() < NEAR_ZERO { normals[0] = n; }
     if normals[1].length_squared() < NEAR_ZERO { normals[1] = n; }
     if normals[2].length_squared() < NEAR_ZERO { normals[2] = n; }
-    _fix_winding_order(vertices, normals);
+    // The face normal is normalized once here and shared with the winding check
+    _fix_winding_order(vertices, normals, &n);
 }
-fn _fix_winding_order(vertices: &mut Box<[Point3; 3]>, normals: &mut Box<[Vec3A; 3]>) {
-    let n = (vertices[1] - vertices[0]).cross(vertices[2] - vertices[0]).normalize();
+fn _fix_winding_order(vertices: &mut Box<[Point3; 3]>, normals: &mut Box<[Vec3A; 3]>, n: &Vec3A) {
+    let n: Vec3A = *n;
     let all_normals_have_wrong_orientation = normals[0].dot(n) < 0.0 && normals[1].dot(n) < 0.0 && normals[2].dot(n) < 0.0;
     if all_normals_have_wrong_orientation {
         // Swap vertices 1 and 2 and normals 1 and 2